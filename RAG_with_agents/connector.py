@@ -14,37 +14,56 @@ This file provides a variety of classes that offer connections for each specifie
 Create a connector instance and use `print(instance._help())` to get more information.
 """
 
-import gc
-import sys
-from logger import logger
-from typing import Optional, Self
+import inspect
+import threading
+from logger import get_logger
+from typing import ClassVar, Optional, get_origin
 from abc import ABC, abstractmethod
-from settings import SettingsLoader
+from settings_cache import load_credentials
 from dataclasses import dataclass, field
 
 
+class ConnectorConfigError(Exception):
+    pass
+
+
 class AbstractConnector(ABC):
+    __slots__ = ()
+    _PROTECTED: ClassVar[frozenset] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        # collect the instance fields of the whole hierarchy once, at class creation
+        super().__init_subclass__(**kwargs)
+        cls._PROTECTED = frozenset(
+            name
+            for klass in cls.__mro__
+            for name, annotation in inspect.get_annotations(klass).items()
+            if not (annotation is ClassVar or get_origin(annotation) is ClassVar)
+        )
+
     @abstractmethod
     def _load_settings(self) -> None:
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class OpenAIConnector(AbstractConnector):
     settings_path: str
     _api_key: str = None
-    _instance: Self = None
     _initialized: bool = False
     _use_organization_id: bool = True
     _organization_id: Optional[str] = None
     _available_models: list = field(default_factory=list)
 
+    _instance: ClassVar[Optional["OpenAIConnector"]] = None
+
     def __setattr__(self, name, value):
-        if self._initialized and name in self.__annotations__:
+        # slots are empty until the dataclass __init__ assigns them
+        if getattr(self, "_initialized", False) and name in self._PROTECTED:
             raise AttributeError(
                 f"Cannot modify attribute '{name}' after initialization."
             )
-        super().__setattr__(name, value)
+        object.__setattr__(self, name, value)
 
     def __post_init__(self):
         if not self._initialized:
@@ -53,51 +72,36 @@ class OpenAIConnector(AbstractConnector):
 
     def _load_settings(self) -> None:
         try:
-            settings = SettingsLoader(
-                settings_path=self.settings_path
-            ).load_credentials()
-            settings = settings["connector"]["openai"]
+            settings = load_credentials(self.settings_path)["connector"]["openai"]
             self._api_key = settings["api_key"]
             if self._use_organization_id:
                 self._organization_id = settings["organization_id"]
             self._available_models = settings["model"]
-            del settings
-            gc.collect()
         except KeyError as e:
-            logger.critical(f"Missing key in settings: {e}")
-            sys.exit(1)
-        except Exception as e:
-            logger.critical(f"Cannot parse credentials file: {e}")
-            sys.exit(1)
+            get_logger().critical(f"Missing key in settings: {e}")
+            raise ConnectorConfigError(f"Missing key in settings: {e}") from e
+        except (OSError, TypeError, ValueError) as e:
+            get_logger().critical(f"Cannot parse credentials file: {e}")
+            raise ConnectorConfigError(f"Cannot parse credentials file: {e}") from e
 
         if not self._initialized:
-            try:
-                if self._use_organization_id:
-                    if not (self._api_key and self._use_organization_id):
-                        logger.critical(
-                            f"Missing _api_key or _organization_id. Cannot connect to OpenAI: {e}"
-                        )
-                        sys.exit(1)
-                else:
-                    if not self._api_key:
-                        logger.critical(
-                            f"Missing _api_key. Cannot connect to OpenAI: {e}"
-                        )
-                        sys.exit(1)
-            except KeyError as e:
-                logger.critical(f"Missing key in settings: {e}")
-                sys.exit(1)
-            except Exception as e:
-                logger.critical(f"Exception error: {e}")
-                sys.exit(1)
+            if self._use_organization_id:
+                if not (self._api_key and self._organization_id):
+                    message = "Missing _api_key or _organization_id. Cannot connect to OpenAI."
+                    get_logger().critical(message)
+                    raise ConnectorConfigError(message)
+            elif not self._api_key:
+                message = "Missing _api_key. Cannot connect to OpenAI."
+                get_logger().critical(message)
+                raise ConnectorConfigError(message)
 
     def _help(self) -> str:
         return """
         1) Variables
             .. settings_path: str -> path to your local file containing credentials. By default you can find a predefined file in ./settings/credentials.json
             .. _api_key: str = None -> api key / token you need to create on OpenAI's website.
-            .. _instance: Self = None -> this class instance; for the singleton class all new instances will share the same id.
-            .. _initialized: bool = False -> once the non-singleton class is initialized, it's not possible to change values of the class' attributes. New attributes can be added. 
+            .. _instance: ClassVar = None -> class-level instance registry; for the singleton class all new instances will share the same id.
+            .. _initialized: bool = False -> once the non-singleton class is initialized, it's not possible to change values of the class' attributes or add new ones.
             .. _use_organization_id: bool -> specify if you want your class to utilize organization's id value.
             .. _organization_id: Optional[str] -> It is not always necessary to use organization's id. If you don't need it, state 'null' in the ./settings/credentials.json file and set _use_organization_id = False.
             .. _available_models: list -> you can specify in the ./settings/credentials.json OpenAI's models you'd like to use in this project. 
@@ -158,33 +162,50 @@ class OpenAIConnector(AbstractConnector):
 
 
 class OpenAISingletonConnector(OpenAIConnector):
+    __slots__ = ()
+    _instance_lock = threading.Lock()
+
     def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(OpenAIConnector, cls).__new__(cls)
-        return cls._instance
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(OpenAIConnector, cls).__new__(cls)
+            return cls._instance
+
+    def __init__(self, *args, **kwargs):
+        # the dataclass __init__ would reset every field on each call
+        if getattr(self, "_initialized", False):
+            return
+        with self._instance_lock:
+            if not getattr(self, "_initialized", False):
+                super().__init__(*args, **kwargs)
 
     def __setattr__(self, name, value):
-        if name in self.__annotations__.keys():
-            super().__setattr__(name, value)
+        if name in self._PROTECTED:
+            object.__setattr__(self, name, value)
 
     def __post_init__(self):
-        if not self._initialized:
-            self._load_settings()
+        self._load_settings()
+        self._initialized = True
 
 
-@dataclass
-class HuggingFaceConnector:
+@dataclass(slots=True)
+class HuggingFaceConnector(AbstractConnector):
     settings_path: str
     _api_key: str = None
-    _instance: Self = None
     _initialized: bool = False
 
+    _instance: ClassVar[Optional["HuggingFaceConnector"]] = None
+
     def __setattr__(self, name, value):
-        if self._initialized and name in self.__annotations__:
+        # slots are empty until the dataclass __init__ assigns them
+        if getattr(self, "_initialized", False) and name in self._PROTECTED:
             raise AttributeError(
                 f"Cannot modify attribute '{name}' after initialization."
             )
-        super().__setattr__(name, value)
+        object.__setattr__(self, name, value)
 
     def __post_init__(self):
         if not self._initialized:
@@ -192,19 +213,23 @@ class HuggingFaceConnector:
             self._initialized = True
 
     def _load_settings(self) -> None:
-        settings = SettingsLoader(settings_path=self.settings_path).load_credentials()
-        settings = settings["connector"]["huggingface"]
-        self._api_key = settings["api_key"]
-        del settings
-        gc.collect()
+        try:
+            settings = load_credentials(self.settings_path)["connector"]["huggingface"]
+            self._api_key = settings["api_key"]
+        except KeyError as e:
+            get_logger().critical(f"Missing key in settings: {e}")
+            raise ConnectorConfigError(f"Missing key in settings: {e}") from e
+        except (OSError, TypeError, ValueError) as e:
+            get_logger().critical(f"Cannot parse credentials file: {e}")
+            raise ConnectorConfigError(f"Cannot parse credentials file: {e}") from e
 
     def _help(self) -> str:
         return """
         1) Variables
             .. settings_path: str -> path to your local file containing credentials. By default you can find a predefined file in ./settings/credentials.json
             .. _api_key: str = None -> api key / token you need to create on Huggingface website.
-            .. _instance: Self = None -> this class instance; for the singleton class all new instances will share the same id.
-            .. _initialized: bool = False -> once the non-singleton class is initialized, it's not possible to change values of the class' attributes. New attributes can be added. 
+            .. _instance: ClassVar = None -> class-level instance registry; for the singleton class all new instances will share the same id.
+            .. _initialized: bool = False -> once the non-singleton class is initialized, it's not possible to change values of the class' attributes or add new ones.
         
         2) API and usage
         To use Huggingcafe's API, you need to create an account: https://huggingface.co
@@ -252,15 +277,30 @@ class HuggingFaceConnector:
 
 
 class HuggingFaceSingletonConnector(HuggingFaceConnector):
+    __slots__ = ()
+    _instance_lock = threading.Lock()
+
     def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(HuggingFaceConnector, cls).__new__(cls)
-        return cls._instance
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(HuggingFaceConnector, cls).__new__(cls)
+            return cls._instance
+
+    def __init__(self, *args, **kwargs):
+        # the dataclass __init__ would reset every field on each call
+        if getattr(self, "_initialized", False):
+            return
+        with self._instance_lock:
+            if not getattr(self, "_initialized", False):
+                super().__init__(*args, **kwargs)
 
     def __setattr__(self, name, value):
-        if name in self.__annotations__.keys():
-            super().__setattr__(name, value)
+        if name in self._PROTECTED:
+            object.__setattr__(self, name, value)
 
     def __post_init__(self):
-        if not self._initialized:
-            self._load_settings()
+        self._load_settings()
+        self._initialized = True
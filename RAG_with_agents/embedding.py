@@ -4,16 +4,21 @@ __author__ = "https://github.com/pyautoml"
 __version__ = "1.0.0"
 
 
-import gc
 import os
-import sys
+import threading
+import multiprocessing
 import torch.cuda
+import numpy as np
 from tools import Tools
-from typing import List
-from logger import logger
+from abc import ABC
+from typing import Any, ClassVar, Dict, List, Tuple
+from functools import cached_property
+from concurrent.futures import ProcessPoolExecutor
+from logger import get_logger
+import pymupdf
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import (
-    PDFMinerLoader,
     DirectoryLoader,
     UnstructuredPDFLoader,
 )
@@ -23,7 +28,11 @@ class AbstractEmbedding(ABC):
     def create_embedding(self, text: str) -> list:
         pass
 
+
 class HuggingFaceEmbedding(AbstractEmbedding):
+    _MODEL_CACHE: ClassVar[Dict[Tuple[str, str], Any]] = {}
+    _MODEL_LOCK: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         credentials: dict,
@@ -40,7 +49,6 @@ class HuggingFaceEmbedding(AbstractEmbedding):
 
         # local cache
         self.cache_folder = cache_folder
-        Tools.create_directory(cache_folder)
 
         # model name and dimension
         self.model_name = embedding_model["name"]
@@ -49,22 +57,54 @@ class HuggingFaceEmbedding(AbstractEmbedding):
             self.credentials["model"][model]["name"]
             for model in self.credentials["model"]
         ]
-        if self.model_name in self.supported_models:
-            self.model = Tools.load_model(
-                model_name=self.model_name, cache_folder=self.cache_folder
-            )
-        else:
-            logger.critical(
-                f"Model not supported. Currently supported models: {self.supported_models}"
-            )
-            sys.exit(1)
 
-        self.recursive_text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len
-        )
+        # text splitter settings
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
 
         del self.credentials
-        gc.collect()
+
+    @cached_property
+    def model(self):
+        if self.model_name not in self.supported_models:
+            message = f"Model not supported. Currently supported models: {self.supported_models}"
+            get_logger().critical(message)
+            raise ValueError(message)
+
+        # one copy of the weights per process, shared by all instances
+        key = (self.model_name, self.cache_folder)
+        with HuggingFaceEmbedding._MODEL_LOCK:
+            model = HuggingFaceEmbedding._MODEL_CACHE.get(key)
+            if model is None:
+                model = self._load_model()
+                HuggingFaceEmbedding._MODEL_CACHE[key] = model
+        return model
+
+    def _load_model(self):
+        Tools.create_directory(self.cache_folder)
+        model = Tools.load_model(
+            model_name=self.model_name, cache_folder=self.cache_folder
+        )
+
+        # half precision is enough for cosine similarity and doubles throughput
+        if self.device == "gpu":
+            model.half()
+        torch.set_float32_matmul_precision("medium")
+        return model
+
+    @cached_property
+    def recursive_text_splitter(self) -> RecursiveCharacterTextSplitter:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            length_function=len,
+        )
+
+    def __getstate__(self) -> dict:
+        # workers only split text; do not pickle the loaded model into them
+        state = self.__dict__.copy()
+        state.pop("model", None)
+        return state
 
     def create_embedding(self, text: [str | list]) -> [str | list]:
         if isinstance(text, list):
@@ -72,16 +112,42 @@ class HuggingFaceEmbedding(AbstractEmbedding):
         else:
             return self.create_single_embedding(text)
 
-    def create_single_embedding(self, sentence: str) -> str:
-        return self.model.encode(sentence)
+    def create_single_embedding(self, sentence: str) -> np.ndarray:
+        return self.model.encode(
+            sentence, convert_to_numpy=True, normalize_embeddings=True
+        )
+
+    def create_multiple_embeddings(
+        self, sentences: List[str], batch_size: int = 64
+    ) -> np.ndarray:
+        return self.model.encode(
+            sentences,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            normalize_embeddings=True,
+        )
 
-    def create_multiple_embeddings(self, sentences: List[str]) -> None:
-        return list(map(self.create_single_embedding, sentences))
+    def process_single_pdf(self, path_to_pdf: str) -> List[Document]:
+        with pymupdf.open(path_to_pdf) as pdf:
+            text = "\n".join(page.get_text("text") for page in pdf)
+        data = [Document(page_content=text, metadata={"source": path_to_pdf})]
+        return self.recursive_text_splitter.split_documents(data)
 
-    def process_single_pdf(self, path_to_pdf: str) -> None:
-        loader = PDFMinerLoader(path_to_pdf)
-        data = loader.load()
-        return self._recursive_text_splitter.split_documents(data)
+    def process_pdf_directory(
+        self, directory: str, max_workers: int = None
+    ) -> List[List[Document]]:
+        paths = [
+            os.path.join(directory, file)
+            for file in sorted(os.listdir(directory))
+            if file.lower().endswith(".pdf")
+        ]
+        # spawn, not fork: a forked worker would inherit the logger's QueueHandler
+        # without the listener thread draining it
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            return list(executor.map(self.process_single_pdf, paths, chunksize=4))
 
-    def process_texts(self, text: str) -> None:
-        return self._recursive_text_splitter.split_text(text)
+    def process_texts(self, text: str) -> List[str]:
+        return self.recursive_text_splitter.split_text(text)
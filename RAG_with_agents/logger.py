@@ -1,9 +1,12 @@
 import os
+import queue
+import atexit
 import logging
 import threading
 from enum import Enum
 import logging.handlers
-from dataclasses import dataclass
+from functools import lru_cache
+from dataclasses import dataclass, field
 
 
 class LogLevel(Enum):
@@ -14,24 +17,36 @@ class LogLevel(Enum):
     CRITICAL = logging.CRITICAL
 
 
-@dataclass
+@lru_cache(maxsize=1)
+def _calling_module() -> str:
+    return os.path.basename(os.getcwd()).lower()
+
+
+@dataclass(slots=True)
 class CustomLogger:
     log_level: LogLevel
+    calling_module: str = field(init=False, repr=False)
+    log_dir: str = field(init=False, repr=False)
+    logger: logging.Logger = field(init=False, repr=False)
+    listener: logging.handlers.QueueListener = field(init=False, repr=False)
 
     def __post_init__(self):
-        self.calling_module = str(os.getcwd()).rsplit("\\")[-1]
+        self.calling_module = _calling_module()
         self.log_dir = self.setup_logger_directory()
         self.setup_logger()
-        self.log_lock = threading.Lock()
 
     def setup_logger_directory(self):
-        folder_name = f"logs_{self.calling_module.lower()}"
+        folder_name = f"logs_{self.calling_module}"
         log_dir = os.path.join(os.getcwd(), folder_name)
         os.makedirs(log_dir, exist_ok=True)
         return log_dir
 
     def setup_logger(self):
         self.logger = logging.getLogger(__name__)
+        self.listener = None
+        # already configured by an earlier instance; leave its level and handlers alone
+        if self.logger.handlers:
+            return
 
         if self.log_level not in LogLevel:
             self.log_level = LogLevel.INFO
@@ -48,34 +63,51 @@ class CustomLogger:
         )
         file_handler.setLevel(self.log_level.value)
         file_handler.setFormatter(formatter)
-        file_handler.createLock()
 
         console_handler = logging.StreamHandler()
         console_handler.setLevel(self.log_level.value)
         console_handler.setFormatter(formatter)
-        console_handler.createLock()
 
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # callers only enqueue records; file and console I/O run on the listener thread
+        log_queue = queue.Queue(-1)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self.listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
 
     def info(self, message):
-        with self.log_lock:
-            self.logger.info(message)
+        self.logger.info(message)
 
     def error(self, message):
-        with self.log_lock:
-            self.logger.error(message)
+        self.logger.error(message)
 
     def critical(self, message):
-        with self.log_lock:
-            self.logger.critical(message)
+        self.logger.critical(message)
 
     def exception(self, message):
-        with self.log_lock:
-            self.logger.exception(message)
+        self.logger.exception(message)
 
     def __reduce__(self):
         return (self.__class__, (self.log_level,))
 
 
-logger = CustomLogger(log_level=LogLevel.INFO)
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_logger() -> CustomLogger:
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = CustomLogger(log_level=LogLevel.INFO)
+    return _logger
+
+
+def __getattr__(name):
+    # `from logger import logger` builds the shared logger on first use only
+    if name == "logger":
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
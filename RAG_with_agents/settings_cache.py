@@ -0,0 +1,16 @@
+import os
+import copy
+from functools import lru_cache
+from settings import SettingsLoader
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(abs_path: str, mtime_ns: int) -> dict:
+    # mtime_ns is part of the cache key only: an edited file gets re-parsed
+    return SettingsLoader(settings_path=abs_path).load_credentials()
+
+
+def load_credentials(settings_path: str) -> dict:
+    abs_path = os.path.abspath(settings_path)
+    st = os.stat(abs_path)
+    return copy.deepcopy(_load_json_cached(abs_path, st.st_mtime_ns))
@@ -1,18 +1,30 @@
-import os
-import sys
-import json
+import asyncio
 import openai
+import orjson
+import numpy as np
 import requests
-from typing import Any
+from typing import Any, Iterator
 from dataclasses import dataclass, field
+from settings_cache import load_settings, resolve_settings_path
+from exceptions import ConnectorConfigError, ConnectorRequestError
+from http_session import create_session
 
+_SESSION = create_session()
 
-@dataclass
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+@dataclass(slots=True)
 class OpenAiConnector:
     settings: str
     _api_key: str = None
     _organization: str = None
     _headers: dict = field(default_factory=lambda: {})
+    _client: openai.OpenAI = field(default=None, init=False, repr=False)
+    _aclient: openai.AsyncOpenAI = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         api_settings = self._setup()
@@ -21,37 +33,30 @@ class OpenAiConnector:
         self._headers = {
             "Authorization": f"Bearer {self._api_key}",
             "OpenAI-Organization": f"{self._organization}",
+            "Content-Type": "application/json",
         }
         self._client = openai.OpenAI(api_key=self._api_key)
+        self._aclient = openai.AsyncOpenAI(
+            api_key=self._api_key, organization=self._organization
+        )
         print("Successfull data setup.")
 
     def _setup(self) -> dict:
         obligatory_keys = ["api_key", "organization"]
 
+        # verify file path
+        file = resolve_settings_path(self.settings)
+
+        # load settings data
         try:
-            # verify file path
-            if os.path.exists(self.settings):
-                file = self.settings
-            else:
-                file = os.path.abspath(
-                    os.path.join(os.path.dirname(__file__), self.settings)
-                )
-                if not os.path.exists(file):
-                    print(f"Invalid file path: {file}", flush=True)
-                    sys.exit(1)
-
-            # load settings data
-            with open(file, "r") as f:
-                loaded_data = json.load(f)
-
-            for key in obligatory_keys:
-                if key not in loaded_data.keys():
-                    print(f"Missing {key} key in json settings file.", flush=True)
-                    sys.exit(1)
-            return loaded_data
-        except Exception as e:
-            print(f"Cannot find or load settings: {e}", flush=True)
-            sys.exit(1)
+            loaded_data = load_settings(file)
+        except (OSError, ValueError) as e:
+            raise ConnectorConfigError(f"Cannot find or load settings: {e}") from e
+
+        for key in obligatory_keys:
+            if key not in loaded_data.keys():
+                raise ConnectorConfigError(f"Missing {key} key in json settings file.")
+        return loaded_data
 
     def _generate_embedding(
         self,
@@ -61,33 +66,124 @@ class OpenAiConnector:
         embeddings_endpoint: str = None,
         embedding_type: str = "text-embedding-ada-002",
     ) -> Any:
-        if not message:
-            print("Message cannot be empty.", flush=True)
-            sys.exit(1)
+        embeddings = self._generate_embeddings_batch(
+            messages=[message],
+            api_version=api_version,
+            metadata=metadata,
+            embeddings_endpoint=embeddings_endpoint,
+            embedding_type=embedding_type,
+        )
+        return embeddings if metadata else embeddings[0]
+
+    def _generate_embeddings_batch(
+        self,
+        messages: list[str],
+        batch_size: int = 512,
+        api_version: str = "v1",
+        metadata: bool = False,
+        embeddings_endpoint: str = None,
+        embedding_type: str = "text-embedding-ada-002",
+    ) -> np.ndarray | list:
+        # the endpoint accepts up to 2048 inputs per request, returned in order
+        if not messages or not all(messages):
+            raise ValueError("Message cannot be empty.")
 
         if not embeddings_endpoint:
             embeddings_endpoint = f"https://api.openai.com/{api_version}/embeddings"
 
-        data = {"input": message, "model": embedding_type}
+        # metadata: list of raw data items, otherwise one float32 row per message
+        embeddings = [] if metadata else None
+        offset = 0
+        for batch in _chunks(messages, batch_size):
+            data = orjson.dumps({"input": batch, "model": embedding_type})
 
-        try:
-            response = requests.post(
-                embeddings_endpoint, headers=self._headers, json=data
-            )
-            response = response.json()
+            try:
+                response = _SESSION.post(
+                    embeddings_endpoint, headers=self._headers, data=data
+                )
+                response = orjson.loads(response.content)
+            except (requests.RequestException, ValueError) as e:
+                raise ConnectorRequestError(f"Post error: {e}") from e
+
+            try:
+                items = response["data"]
+            except KeyError as e:
+                raise ConnectorRequestError(
+                    f"Missing keys in response: {response}"
+                ) from e
+
+            # a short response would leave uninitialized rows in the result
+            if len(items) != len(batch):
+                raise ConnectorRequestError(
+                    f"Expected {len(batch)} embeddings in response, got {len(items)}."
+                )
 
             try:
                 if metadata:
-                    return response["data"]
+                    embeddings.extend(items)
                 else:
-                    return response["data"][0]["embedding"]
+                    for row, d in enumerate(items, start=offset):
+                        if embeddings is None:
+                            embeddings = np.empty(
+                                (len(messages), len(d["embedding"])), dtype=np.float32
+                            )
+                        embeddings[row] = d["embedding"]
             except KeyError as e:
-                print(f"Missing keys in response: {response.text}", flush=True)
-                sys.exit(1)
+                raise ConnectorRequestError(
+                    f"Missing keys in response: {response}"
+                ) from e
+            offset += len(batch)
+
+        return embeddings
+
+    async def _agenerate_embeddings(
+        self,
+        messages: list[str],
+        batch_size: int = 512,
+        max_concurrency: int = 8,
+        embedding_type: str = "text-embedding-ada-002",
+    ) -> np.ndarray:
+        if not messages or not all(messages):
+            raise ValueError("Message cannot be empty.")
+
+        # batches run concurrently, but at most max_concurrency are in flight
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def embed(batch: list[str]) -> list:
+            async with semaphore:
+                try:
+                    response = await self._aclient.embeddings.create(
+                        input=batch, model=embedding_type
+                    )
+                except openai.OpenAIError as e:
+                    raise ConnectorRequestError(f"Post error: {e}") from e
+            if len(response.data) != len(batch):
+                raise ConnectorRequestError(
+                    f"Expected {len(batch)} embeddings in response, got {len(response.data)}."
+                )
+            return [d.embedding for d in response.data]
+
+        results = await asyncio.gather(
+            *(embed(batch) for batch in _chunks(messages, batch_size))
+        )
+        return np.asarray(
+            [embedding for result in results for embedding in result],
+            dtype=np.float32,
+        )
 
-        except Exception as e:
-            print(f"Post error: {e}", flush=True)
-            sys.exit(1)
+    async def _aprompt(
+        self, prompt: str, model="gpt-4", max_tokens=300, temperature=0.4
+    ) -> str:
+        try:
+            response = await self._aclient.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            return response.choices[0].message.content
+        except openai.OpenAIError as e:
+            raise ConnectorRequestError(f"Error: prompt OpenAi {e}") from e
 
     def _prompt(
         self, prompt: str, model="gpt-4", max_tokens=300, temperature=0.4
@@ -100,9 +196,8 @@ class OpenAiConnector:
                 max_tokens=max_tokens,
             )
             return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error: prompt OpenAi {e}")
-            sys.exit(1)
+        except openai.OpenAIError as e:
+            raise ConnectorRequestError(f"Error: prompt OpenAi {e}") from e
 
     def _vision_prompt(self, text: str, url: str, model: str = "gpt-4-vision-preview"):
         print("Url: ", url)
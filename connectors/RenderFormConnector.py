@@ -5,16 +5,18 @@ __last_update__ = "26.11.2023"
 __author__ = "https://github.com/pyautoml"
 __more_about_renderform__ = "https://renderform.io"
 
-import os
 import re
-import sys
-import json
-import requests
+import orjson
 import pandas as pd
 from dataclasses import dataclass, field
+from settings_cache import load_settings, resolve_settings_path
+from exceptions import ConnectorConfigError
+from http_session import create_session
 
+_SESSION = create_session()
 
-@dataclass
+
+@dataclass(slots=True)
 class RenderForm:
     settings: str
     _headers: dict = field(default_factory=lambda: {})
@@ -22,7 +24,11 @@ class RenderForm:
 
     def __post_init__(self) -> None:
         self.settings = self._setup()
-        self._img_headers = {"x-api-key": self.settings["x-api-key"], "output": "image"}
+        self._img_headers = {
+            "x-api-key": self.settings["x-api-key"],
+            "output": "image",
+            "Content-Type": "application/json",
+        }
         self._headers = {
             "accept": "application/json",
             "x-api-key": self.settings["x-api-key"],
@@ -31,35 +37,24 @@ class RenderForm:
     def _setup(self) -> dict:
         obligatory_keys = ["x-api-key"]
 
+        file = resolve_settings_path(self.settings)
+
         try:
-            if os.path.exists(self.settings):
-                file = self.settings
-            else:
-                file = os.path.abspath(
-                    os.path.join(os.path.dirname(__file__), self.settings)
-                )
-                if not os.path.exists(file):
-                    print(f"Invalid file path: {file}", flush=True)
-                    sys.exit(1)
-
-            with open(file, "r") as f:
-                loaded_data = json.load(f)
-
-            for key in obligatory_keys:
-                if key not in loaded_data.keys():
-                    print(f"Missing {key} key in json settings file.", flush=True)
-                    sys.exit(1)
-            return loaded_data
-        except Exception as e:
-            print(f"Cannot find or load settings: {e}", flush=True)
-            sys.exit(1)
+            loaded_data = load_settings(file)
+        except (OSError, ValueError) as e:
+            raise ConnectorConfigError(f"Cannot find or load settings: {e}") from e
+
+        for key in obligatory_keys:
+            if key not in loaded_data.keys():
+                raise ConnectorConfigError(f"Missing {key} key in json settings file.")
+        return loaded_data
 
     def _get_template(self, template_id: str, version: str = "v2") -> dict:
-        data = requests.get(
+        data = _SESSION.get(
             url=f"https://api.renderform.io/api/{version}/my-templates/{template_id}",
             headers=self._headers,
         )
-        return data.json()
+        return orjson.loads(data.content)
 
     def _render_template(
         self,
@@ -69,8 +64,8 @@ class RenderForm:
         image_url: str = None,
         image_text: str = None,
         api_version: str = "v2",
-        formatting: dict = {},
-    ) -> None:
+        formatting: dict = None,
+    ) -> str:
         """
         Formatting is customizable. Replace "mytext" to your text container tag. 'formatting' dict can be customized by adding new key-value pairs.s
         Example:
@@ -88,18 +83,21 @@ class RenderForm:
             }
         """
 
+        # copy, so neither the caller's dict nor a shared default is mutated
+        formatting = dict(formatting or {})
+
         if image_url and img_container_tag:
             formatting[f"{img_container_tag}.src"] = image_url
 
         if image_text and text_container_tag:
-            formatting[f"{img_container_tag}.text"] = f"{image_text}"
+            formatting[f"{text_container_tag}.text"] = f"{image_text}"
 
-        response = requests.post(
+        response = _SESSION.post(
             url=f"https://api.renderform.io/api/{api_version}/render",
             headers=self._img_headers,
-            json={"template": template_id, "data": {formatting}},
+            data=orjson.dumps({"template": template_id, "data": formatting}),
         )
-        response = response.json()
+        response = orjson.loads(response.content)
         return response["href"]
 
 
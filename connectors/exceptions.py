@@ -0,0 +1,6 @@
+class ConnectorConfigError(Exception):
+    """Settings file is missing, unreadable or incomplete."""
+
+
+class ConnectorRequestError(Exception):
+    """Remote service call failed or returned an unexpected response."""
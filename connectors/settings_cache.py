@@ -0,0 +1,29 @@
+import os
+import copy
+import json
+from functools import lru_cache
+from exceptions import ConnectorConfigError
+
+
+@lru_cache(maxsize=128)
+def resolve_settings_path(path: str) -> str:
+    # resolved once per path; later constructions skip the exists/abspath calls
+    if os.path.exists(path):
+        return os.path.abspath(path)
+    alt = os.path.abspath(os.path.join(os.path.dirname(__file__), path))
+    if os.path.exists(alt):
+        return alt
+    raise ConnectorConfigError(f"Invalid file path: {path!r} / {alt!r}")
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(abs_path: str, mtime_ns: int) -> dict:
+    # mtime_ns is part of the cache key only: an edited file gets re-parsed
+    with open(abs_path, "r") as f:
+        return json.load(f)
+
+
+def load_settings(path: str) -> dict:
+    abs_path = os.path.abspath(path)
+    st = os.stat(abs_path)
+    return copy.deepcopy(_load_json_cached(abs_path, st.st_mtime_ns))